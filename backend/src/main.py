@@ -1,26 +1,54 @@
 import json
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status, BackgroundTasks
+import math
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status, BackgroundTasks, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.services.game_manager import GameManager
 from src.services.openai_service import OpenAIClient
+from src.services.rate_limiter import TokenBucketLimiter, try_acquire_all
 from src.models import (
     StartResponse, AnswerRequest, AnswerResponse, 
     QuestionSchema, WebSocketProtocolDocs, 
     GameWonSchema, GenerationStatusResponse, NextLevelAccepted,
-    ErrorResponse, ResetResponse
+    ErrorResponse, ResetResponse, StatsResponse, WsError
 )
 
 tags_metadata = [
     {"name": "Game Flow", "description": "Gerenciamento de sessão, perguntas e respostas."},
     {"name": "Tutor AI", "description": "Interação em tempo real com o assistente inteligente."},
+    {"name": "Analytics", "description": "Métricas agregadas de jogabilidade."},
 ]
 
+async def export_stats_periodically():
+    stats = game_manager.stats
+    while True:
+        await asyncio.sleep(stats.export_interval)
+        try:
+            await asyncio.to_thread(stats.export_to_file, stats.export_snapshot())
+        except Exception as e:
+            print(f"Falha ao exportar estatísticas: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    export_task = None
+    if game_manager.stats.export_path:
+        export_task = asyncio.create_task(export_stats_periodically())
+    yield
+    if export_task:
+        export_task.cancel()
+        try:
+            await export_task
+        except asyncio.CancelledError:
+            pass
+
 app = FastAPI(
     title="Jogo do Milhão AI", 
     version="2.11.0", 
     description="API para Quiz Game com suporte a IA Generativa e Tutoria em Tempo Real.",
-    openapi_tags=tags_metadata
+    openapi_tags=tags_metadata,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -34,14 +62,42 @@ app.add_middleware(
 game_manager = GameManager()
 ai_client = OpenAIClient()
 
+# Os limites por cliente são mais largos que os por sessão: vários jogadores
+# podem compartilhar o mesmo IP (NAT). Atrás de um proxy reverso, a variável
+# FORWARDED_ALLOW_IPS do uvicorn precisa conter o endereço do proxy; senão o
+# X-Forwarded-For é ignorado e todos os jogadores caem na mesma bucket.
+settings = game_manager.settings
+start_client_limiter = TokenBucketLimiter.from_settings(settings, "start", "per_client", 60, 1.0)
+next_level_session_limiter = TokenBucketLimiter.from_settings(settings, "next_level", "per_session", 3, 0.02)
+next_level_client_limiter = TokenBucketLimiter.from_settings(settings, "next_level", "per_client", 30, 0.5)
+chat_session_limiter = TokenBucketLimiter.from_settings(settings, "chat_message", "per_session", 5, 0.2)
+chat_client_limiter = TokenBucketLimiter.from_settings(settings, "chat_message", "per_client", 60, 2.0)
+
+def client_key(client) -> str | None:
+    return f"client:{client.host}" if client else None
+
+def enforce_rate_limit(*checks: tuple[TokenBucketLimiter, str | None]):
+    wait = try_acquire_all(*checks)
+    if wait > 0:
+        headers = {"Retry-After": str(math.ceil(wait))} if math.isfinite(wait) else None
+        raise HTTPException(
+            status_code=429,
+            detail="Muitas requisições. Aguarde um pouco antes de tentar novamente.",
+            headers=headers
+        )
+
 @app.post(
     "/start", 
     response_model=StartResponse, 
+    responses={
+        429: {"description": "Limite de requisições excedido.", "model": ErrorResponse}
+    },
     tags=["Game Flow"],
     summary="Inicia uma nova sessão",
     description="Cria uma nova instância de jogo, gera um UUID único e reinicia o estado do jogador."
 )
-async def start_game():
+async def start_game(request: Request):
+    enforce_rate_limit((start_client_limiter, client_key(request.client)))
     uuid = game_manager.create_game()
     welcome = game_manager.settings.get("welcome_message", "Jogo iniciado.")
     return {"uuid": uuid, "message": welcome}
@@ -131,21 +187,27 @@ async def answer_question(uuid: str, payload: AnswerRequest):
     responses={
         202: {"description": "Geração iniciada em background.", "model": NextLevelAccepted},
         400: {"description": "Não permitido.", "model": ErrorResponse},
-        404: {"description": "Jogo não encontrado.", "model": ErrorResponse}
+        404: {"description": "Jogo não encontrado.", "model": ErrorResponse},
+        429: {"description": "Limite de requisições excedido.", "model": ErrorResponse}
     },
     tags=["Game Flow"],
     summary="Solicita geração de novas perguntas"
 )
-async def generate_next_level(uuid: str, background_tasks: BackgroundTasks):
+async def generate_next_level(uuid: str, request: Request, background_tasks: BackgroundTasks):
     game = game_manager.get_game(uuid)
     if not game: raise HTTPException(status_code=404, detail="Jogo não encontrado.")
 
 
-    if game['status'] == 'generating':
+    if game['generation_status'] == 'generating':
         raise HTTPException(status_code=400, detail="Aguarde a geração das novas perguntas para tentar novamente.")
     
     if game['status'] != 'won':
         raise HTTPException(status_code=400, detail="Vença o nível atual primeiro.")
+
+    enforce_rate_limit(
+        (next_level_session_limiter, f"session:{uuid}"),
+        (next_level_client_limiter, client_key(request.client))
+    )
     
     game_manager.set_generation_status(uuid, "generating")
     background_tasks.add_task(game_manager.background_generate_level, uuid, ai_client)
@@ -191,6 +253,7 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
     }))
 
     vector_id = game_manager.vector_store_id
+    client_id = client_key(websocket.client)
 
     try:
         while True:
@@ -202,6 +265,16 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
             except json.JSONDecodeError:
                 continue
 
+            wait = try_acquire_all(
+                (chat_session_limiter, f"session:{uuid}"),
+                (chat_client_limiter, client_id)
+            )
+            if wait > 0:
+                retry_msg = f" Tente novamente em {math.ceil(wait)}s." if math.isfinite(wait) else ""
+                error = WsError(content=f"Limite de mensagens excedido.{retry_msg}")
+                await websocket.send_text(error.model_dump_json())
+                continue
+
             game['chat_history'].append({"role": "user", "content": user_msg})
             
             full_response = ""
@@ -222,4 +295,14 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
             game['chat_history'].append({"role": "assistant", "content": full_response})
             
     except WebSocketDisconnect:
-        print(f"Chat finalizado para {uuid}")
\ No newline at end of file
+        print(f"Chat finalizado para {uuid}")
+
+@app.get(
+    "/stats",
+    response_model=StatsResponse,
+    tags=["Analytics"],
+    summary="Estatísticas agregadas do jogo",
+    description="Retorna contadores agregados mantidos incrementalmente (respostas, resets, tempo de conclusão dos níveis e resultados da geração) em tempo constante. O detalhe por pergunta só é gravado na exportação em arquivo (stats_export_path)."
+)
+async def get_stats():
+    return game_manager.stats.snapshot()
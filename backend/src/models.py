@@ -30,6 +30,13 @@ class GenerationStatusResponse(BaseModel):
     status: str = Field(..., description="Estados possíveis: 'idle' (parado), 'generating' (processando), 'completed' (sucesso), 'error' (falha).")
     message: str = Field(..., description="Mensagem amigável de status.")
 
+class StatsResponse(BaseModel):
+    uptime_seconds: float = Field(..., description="Tempo (s) desde que o servidor começou a coletar métricas.")
+    answers: Dict[str, Any] = Field(..., description="Totais de respostas: 'total', 'hit', 'miss' e 'hit_rate'.")
+    resets: int = Field(..., description="Quantidade de níveis reiniciados via /reset.")
+    levels: Dict[str, Any] = Field(..., description="Níveis concluídos/perdidos e histograma de duração ('duration') em segundos.")
+    generation: Dict[str, Any] = Field(..., description="Resultados da geração de níveis: iniciadas, concluídas, falhas, tentativas falhas e tentativas até o sucesso.")
+
 class AnswerRequest(BaseModel):
     option_index: int = Field(..., ge=0, le=3, description="Índice da opção escolhida (0=A, 1=B, 2=C, 3=D).")
 
@@ -1,8 +1,10 @@
 import uuid
 import json
+import time
 from typing import Dict, Optional, List
 from src.config.loader import ConfigLoader
 from src.interfaces.llm import LLMClientInterface
+from src.services.stats_service import GameStats
 
 class GameManager:
     def __init__(self):
@@ -13,6 +15,7 @@ class GameManager:
         self.static_questions: List[dict] = self.full_config.get("questions", [])
         
         self.games: Dict[str, dict] = {}
+        self.stats = GameStats(self.settings)
 
     def create_game(self) -> str:
         game_id = str(uuid.uuid4())
@@ -24,7 +27,8 @@ class GameManager:
             "generation_status": "idle", 
             "generated_questions": [],
             "history": [],
-            "chat_history": [] 
+            "chat_history": [],
+            "level_started_at": time.monotonic()
         }
         return game_id
 
@@ -38,8 +42,10 @@ class GameManager:
         game['current_question_index'] = 0
         game['accumulated_prize'] = 0
         game['status'] = 'active'
+        game['level_started_at'] = time.monotonic()
         
         game['history'] = [] 
+        self.stats.record_reset()
         
         self.init_tutor_context(game_id)
         
@@ -119,10 +125,14 @@ class GameManager:
             "selected": selected,
             "result": "hit" if selected == correct else "miss"
         })
+        self.stats.record_answer(question_data, game['mode'], option_index, selected == correct)
 
         if selected == correct:
             game['accumulated_prize'] += question_data['prize']
             game['current_question_index'] += 1
+            if game['current_question_index'] >= len(questions):
+                started_at = game.get('level_started_at', time.monotonic())
+                self.stats.record_level_completed(time.monotonic() - started_at)
             return True
         else:
             game['status'] = 'lost'
@@ -173,6 +183,7 @@ class GameManager:
             "}"
         )
 
+        self.stats.record_generation_started()
         max_retries = 3
         for attempt in range(max_retries):
             try:
@@ -201,12 +212,16 @@ class GameManager:
                 game['current_question_index'] = 0
                 game['status'] = 'active'
                 game['generation_status'] = 'completed'
+                game['level_started_at'] = time.monotonic()
+                self.stats.record_generation_completed(attempt + 1)
                 return 
 
             except (json.JSONDecodeError, ValueError, Exception) as e:
                 print(f"Tentativa {attempt+1} falhou: {e}")
+                self.stats.record_generation_attempt_failed()
                 if attempt == max_retries - 1:
                     game['generation_status'] = 'error'
+                    self.stats.record_generation_failed()
 
     def init_tutor_context(self, game_id: str):
         game = self.get_game(game_id)
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class TokenBucketLimiter:
+    """Token bucket em memória, com uma bucket por chave (sessão ou cliente).
+
+    Cada verificação é O(1) e o número de chaves é limitado por `max_keys`.
+    Quando a tabela está cheia, só a bucket menos usada recentemente pode ser
+    descartada, e apenas se já tiver voltado à capacidade máxima (descartá-la
+    não perde nada). Caso contrário a chave nova é recusada até que isso
+    aconteça; reiniciar uma bucket parcial deixaria quem rotaciona chaves
+    escapar do limite.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 10000):
+        if not isinstance(capacity, (int, float)) or capacity < 1:
+            raise ValueError(f"capacity deve ser um número >= 1, recebeu: {capacity!r}")
+        if not isinstance(refill_per_second, (int, float)) or refill_per_second <= 0:
+            raise ValueError(f"refill_per_second deve ser um número positivo, recebeu: {refill_per_second!r}")
+        if not isinstance(max_keys, int) or max_keys <= 0:
+            raise ValueError(f"max_tracked_keys deve ser um inteiro positivo, recebeu: {max_keys!r}")
+
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.max_keys = max_keys
+        # chave -> [tokens, último_refill]
+        self.buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: dict,
+        scope: str,
+        key_type: str,
+        default_capacity: float,
+        default_refill: float
+    ) -> "TokenBucketLimiter":
+        """Lê `rate_limits.<scope>.<key_type>` (ex: `chat_message.per_client`)."""
+        limits = settings.get("rate_limits", {})
+        bucket_config = limits.get(scope, {}).get(key_type, {})
+        try:
+            return cls(
+                capacity=bucket_config.get("capacity", default_capacity),
+                refill_per_second=bucket_config.get("refill_per_second", default_refill),
+                max_keys=limits.get("max_tracked_keys", 10000)
+            )
+        except ValueError as e:
+            raise ValueError(f"rate_limits.{scope}.{key_type}: {e}")
+
+    def tokens_at(self, bucket: list, now: float) -> float:
+        return min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+
+    def bucket(self, key: str, now: float, in_use: set) -> Tuple[Optional[list], float]:
+        """Retorna `(bucket, 0)` já reabastecida, ou `(None, espera)` se a chave
+        é nova e não há bucket que possa ser descartada sem perder estado."""
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            self.buckets.move_to_end(key)
+            bucket[0] = self.tokens_at(bucket, now)
+            bucket[1] = now
+            return bucket, 0.0
+
+        if len(self.buckets) >= self.max_keys:
+            oldest_key, oldest = next(iter(self.buckets.items()))
+            missing = self.capacity - self.tokens_at(oldest, now)
+            if oldest_key in in_use or missing > 0:
+                # Espera até a bucket mais antiga encher (no mínimo um token).
+                return None, max(missing, 1.0) / self.refill_per_second
+            del self.buckets[oldest_key]
+
+        bucket = [self.capacity, now]
+        self.buckets[key] = bucket
+        return bucket, 0.0
+
+    def wait_time(self, bucket: list) -> float:
+        missing = 1 - bucket[0]
+        return missing / self.refill_per_second if missing > 0 else 0.0
+
+
+def try_acquire_all(*checks: Tuple[TokenBucketLimiter, Optional[str]]) -> float:
+    """Consome um token de cada par (limiter, chave); chaves `None` são ignoradas.
+
+    Retorna 0 se a requisição foi aceita; caso contrário, quantos segundos
+    faltam para haver token disponível em todas as buckets. Nada é
+    consumido quando qualquer uma delas está sem tokens.
+    """
+    now = time.monotonic()
+    checks = [(limiter, key) for limiter, key in checks if key]
+    in_use = {key for _, key in checks}
+
+    wait = 0.0
+    resolved = []
+    for limiter, key in checks:
+        bucket, table_full_wait = limiter.bucket(key, now, in_use)
+        if bucket is None:
+            wait = max(wait, table_full_wait)
+        else:
+            resolved.append(bucket)
+            wait = max(wait, limiter.wait_time(bucket))
+
+    if wait <= 0:
+        for bucket in resolved:
+            bucket[0] -= 1
+    return wait
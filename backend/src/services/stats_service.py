@@ -0,0 +1,187 @@
+import json
+import hashlib
+import os
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Limites superiores (em segundos) dos buckets do histograma de tempo de nível.
+DEFAULT_DURATION_BUCKETS = [30, 60, 120, 300, 600, 1200, 1800, 3600]
+
+
+class DurationHistogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        # Um bucket extra para valores acima do maior limite ("+Inf").
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b:g}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 3),
+            "avg_seconds": round(self.total / self.count, 3) if self.count else None,
+            "min_seconds": round(self.min, 3) if self.min is not None else None,
+            "max_seconds": round(self.max, 3) if self.max is not None else None,
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class GameStats:
+    """Métricas de jogo atualizadas incrementalmente (sem varrer as sessões)."""
+
+    def __init__(self, settings: dict):
+        self.max_tracked_questions = settings.get("stats_max_tracked_questions", 500)
+        if not isinstance(self.max_tracked_questions, int) or self.max_tracked_questions <= 0:
+            raise ValueError(
+                f"stats_max_tracked_questions deve ser um inteiro positivo, recebeu: {self.max_tracked_questions!r}"
+            )
+
+        self.export_path: Optional[str] = settings.get("stats_export_path")
+        self.export_interval = settings.get("stats_export_interval_seconds", 60)
+        # O intervalo só importa com a exportação ligada; não deve impedir a API de subir.
+        if self.export_path and (not isinstance(self.export_interval, (int, float)) or self.export_interval <= 0):
+            raise ValueError(
+                f"stats_export_interval_seconds deve ser um número positivo, recebeu: {self.export_interval!r}"
+            )
+
+        self.started_at = time.time()
+        self.answers = {"total": 0, "hit": 0, "miss": 0}
+        self.resets = 0
+        self.levels = {"completed": 0, "lost": 0}
+        self.level_durations = DurationHistogram(
+            settings.get("stats_duration_buckets_seconds", DEFAULT_DURATION_BUCKETS)
+        )
+        self.generation = {
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "failed_attempts": 0,
+            "attempts_until_success": {}
+        }
+        # LRU por pergunta: perguntas geradas são únicas por sessão,
+        # então o mapa precisa de um teto para não crescer indefinidamente.
+        self.questions: "OrderedDict[str, dict]" = OrderedDict()
+
+    @staticmethod
+    def _question_key(question: dict, mode: str) -> str:
+        if mode == "static":
+            return f"static:{question.get('id')}"
+        # Ids gerados vêm do LLM sem validação e podem colidir entre sessões
+        # (ou com os ids estáticos), então a chave é derivada do enunciado.
+        digest = hashlib.sha1(question.get("text", "").encode("utf-8")).hexdigest()[:16]
+        return f"gen:{digest}"
+
+    def _question_entry(self, question: dict, mode: str) -> dict:
+        key = self._question_key(question, mode)
+        entry = self.questions.get(key)
+        if entry is None:
+            entry = {
+                "text": question.get("text", ""),
+                "hit": 0,
+                "miss": 0,
+                "option_counts": [0] * len(question.get("options", []))
+            }
+            self.questions[key] = entry
+            if len(self.questions) > self.max_tracked_questions:
+                self.questions.popitem(last=False)
+        else:
+            self.questions.move_to_end(key)
+        return entry
+
+    def record_answer(self, question: dict, mode: str, option_index: int, is_correct: bool):
+        result = "hit" if is_correct else "miss"
+        self.answers["total"] += 1
+        self.answers[result] += 1
+
+        entry = self._question_entry(question, mode)
+        entry[result] += 1
+        entry["option_counts"][option_index] += 1
+
+        if not is_correct:
+            self.levels["lost"] += 1
+
+    def record_level_completed(self, duration_seconds: float):
+        self.levels["completed"] += 1
+        self.level_durations.observe(duration_seconds)
+
+    def record_reset(self):
+        self.resets += 1
+
+    def record_generation_started(self):
+        self.generation["started"] += 1
+
+    def record_generation_attempt_failed(self):
+        self.generation["failed_attempts"] += 1
+
+    def record_generation_completed(self, attempts: int):
+        self.generation["completed"] += 1
+        histogram = self.generation["attempts_until_success"]
+        histogram[str(attempts)] = histogram.get(str(attempts), 0) + 1
+
+    def record_generation_failed(self):
+        self.generation["failed"] += 1
+
+    def snapshot(self) -> dict:
+        """Contadores agregados; custo constante, independe de sessões e perguntas."""
+        total = self.answers["total"]
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "answers": {
+                **self.answers,
+                "hit_rate": round(self.answers["hit"] / total, 4) if total else None
+            },
+            "resets": self.resets,
+            "levels": {
+                **self.levels,
+                "duration": self.level_durations.snapshot()
+            },
+            "generation": {
+                **self.generation,
+                "attempts_until_success": dict(self.generation["attempts_until_success"])
+            }
+        }
+
+    def questions_snapshot(self) -> Dict[str, dict]:
+        """Detalhe por pergunta, O(stats_max_tracked_questions).
+
+        Inclui `option_counts`, que revela a alternativa correta; por isso só
+        vai para a exportação em arquivo, nunca para o endpoint público.
+        """
+        questions: Dict[str, dict] = {}
+        for key, entry in self.questions.items():
+            answered = entry["hit"] + entry["miss"]
+            questions[key] = {
+                "text": entry["text"],
+                "hit": entry["hit"],
+                "miss": entry["miss"],
+                "hit_rate": round(entry["hit"] / answered, 4) if answered else None,
+                "option_counts": list(entry["option_counts"])
+            }
+        return questions
+
+    def export_snapshot(self) -> dict:
+        return {**self.snapshot(), "questions": self.questions_snapshot()}
+
+    def export_to_file(self, snapshot: dict):
+        """Grava o snapshot de forma atômica (arquivo temporário + rename)."""
+        if not self.export_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.export_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.export_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.export_path)
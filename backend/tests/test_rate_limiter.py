@@ -0,0 +1,85 @@
+import pytest
+
+from src.services import rate_limiter
+from src.services.rate_limiter import TokenBucketLimiter, try_acquire_all
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_rejects_when_empty_and_refills(clock):
+    limiter = TokenBucketLimiter(2, 0.5)
+    assert try_acquire_all((limiter, "a")) == 0
+    assert try_acquire_all((limiter, "a")) == 0
+    assert try_acquire_all((limiter, "a")) == pytest.approx(2.0)
+
+    clock[0] += 2
+    assert try_acquire_all((limiter, "a")) == 0
+
+
+def test_rotating_more_keys_than_max_keys_does_not_reset_budget(clock):
+    limiter = TokenBucketLimiter(2, 0.01, max_keys=2)
+
+    accepted = sum(
+        try_acquire_all((limiter, key)) == 0
+        for _ in range(3)
+        for key in ("a", "b", "c")
+    )
+
+    assert accepted == 4
+    assert list(limiter.buckets) == ["a", "b"]
+
+
+def test_full_bucket_is_evicted_for_new_key(clock):
+    limiter = TokenBucketLimiter(2, 1, max_keys=2)
+    try_acquire_all((limiter, "a"))
+    try_acquire_all((limiter, "b"))
+    assert try_acquire_all((limiter, "c")) > 0
+
+    clock[0] += 1
+    assert try_acquire_all((limiter, "c")) == 0
+    assert list(limiter.buckets) == ["b", "c"]
+
+
+def test_nothing_consumed_when_any_bucket_is_empty(clock):
+    session = TokenBucketLimiter(1, 0.1)
+    client = TokenBucketLimiter(10, 0.1)
+
+    assert try_acquire_all((session, "s"), (client, "c")) == 0
+    assert try_acquire_all((session, "s"), (client, "c")) > 0
+    assert client.buckets["c"][0] == 9
+
+
+def test_keys_in_same_check_are_not_evicted(clock):
+    limiter = TokenBucketLimiter(1, 0.5, max_keys=1)
+    assert try_acquire_all((limiter, "a")) == 0
+    assert try_acquire_all((limiter, "a"), (limiter, "b")) > 0
+    assert list(limiter.buckets) == ["a"]
+
+
+def test_none_keys_are_ignored(clock):
+    limiter = TokenBucketLimiter(1, 1)
+    assert try_acquire_all((limiter, None)) == 0
+    assert not limiter.buckets
+
+
+@pytest.mark.parametrize("capacity, refill, max_keys", [
+    (0.5, 1, 10),
+    (1, 0, 10),
+    (1, -1, 10),
+    (1, 1, 0),
+    (1, 1, -5),
+])
+def test_invalid_config_is_rejected(capacity, refill, max_keys):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(capacity, refill, max_keys)
+
+
+def test_from_settings_names_the_bad_key():
+    settings = {"rate_limits": {"chat_message": {"per_client": {"capacity": 0}}}}
+    with pytest.raises(ValueError, match="chat_message.per_client"):
+        TokenBucketLimiter.from_settings(settings, "chat_message", "per_client", 5, 1)
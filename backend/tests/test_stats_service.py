@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from src.services.stats_service import DurationHistogram, GameStats
+
+
+def make_question(qid, text, options=("a", "b", "c", "d")):
+    return {"id": qid, "text": text, "options": list(options)}
+
+
+def test_histogram_value_on_limit_goes_to_that_bucket():
+    hist = DurationHistogram([30, 60])
+    for value in (0, 30, 30.001, 60, 61):
+        hist.observe(value)
+
+    snap = hist.snapshot()
+    assert snap["buckets"] == {"le_30": 2, "le_60": 2, "le_inf": 1}
+    assert snap["count"] == 5
+    assert snap["min_seconds"] == 0
+    assert snap["max_seconds"] == 61
+
+
+def test_histogram_empty_snapshot():
+    snap = DurationHistogram([10]).snapshot()
+    assert snap["count"] == 0
+    assert snap["avg_seconds"] is None
+    assert snap["buckets"] == {"le_10": 0, "le_inf": 0}
+
+
+def test_questions_are_evicted_lru_at_max_tracked():
+    stats = GameStats({"stats_max_tracked_questions": 2})
+    stats.record_answer(make_question(1, "q1"), "static", 0, True)
+    stats.record_answer(make_question(2, "q2"), "static", 0, True)
+    # Usar a pergunta 1 de novo a torna a mais recente.
+    stats.record_answer(make_question(1, "q1"), "static", 1, False)
+    stats.record_answer(make_question(3, "q3"), "static", 0, True)
+
+    questions = stats.questions_snapshot()
+    assert list(questions) == ["static:1", "static:3"]
+    assert questions["static:1"]["hit"] == 1
+    assert questions["static:1"]["miss"] == 1
+    # Os totais agregados não são afetados pela remoção.
+    assert stats.snapshot()["answers"]["total"] == 4
+
+
+def test_generated_questions_do_not_collide_with_static_ids():
+    stats = GameStats({})
+    stats.record_answer(make_question(1, "static q"), "static", 0, True)
+    stats.record_answer(make_question(1, "gen q"), "generated", 1, False)
+
+    questions = stats.questions_snapshot()
+    assert len(questions) == 2
+    assert questions["static:1"]["text"] == "static q"
+
+
+def test_public_snapshot_omits_question_details():
+    stats = GameStats({})
+    stats.record_answer(make_question(1, "q1"), "static", 2, True)
+
+    snap = stats.snapshot()
+    assert "questions" not in snap
+    assert "option_counts" not in json.dumps(snap)
+
+
+def test_export_includes_option_counts(tmp_path):
+    path = tmp_path / "nested" / "stats.json"
+    stats = GameStats({"stats_export_path": str(path)})
+    stats.record_answer(make_question(1, "q1"), "static", 2, True)
+
+    stats.export_to_file(stats.export_snapshot())
+
+    exported = json.loads(path.read_text(encoding="utf-8"))
+    assert exported["questions"]["static:1"]["option_counts"] == [0, 0, 1, 0]
+    assert exported["answers"]["hit"] == 1
+    assert not (tmp_path / "nested" / "stats.json.tmp").exists()
+
+
+def test_export_interval_only_validated_when_export_enabled():
+    GameStats({"stats_export_interval_seconds": 0})
+    with pytest.raises(ValueError):
+        GameStats({"stats_export_path": "stats.json", "stats_export_interval_seconds": 0})
+
+
+@pytest.mark.parametrize("value", [0, -1, 1.5, "10"])
+def test_invalid_max_tracked_questions(value):
+    with pytest.raises(ValueError):
+        GameStats({"stats_max_tracked_questions": value})
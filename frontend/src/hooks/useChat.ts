@@ -3,9 +3,11 @@ import { useCallback, useRef, useState } from "react";
 
 interface ChatMessage {
   id: string;
-  role: "user" | "assistant";
+  role: "user" | "assistant" | "error";
   content: string;
   pending?: boolean;
+  // mensagem do usuário recusada pelo servidor (não entrou no histórico)
+  failed?: boolean;
 }
 
 export function useChat(uuid?: string) {
@@ -102,7 +104,36 @@ export function useChat(uuid?: string) {
       }
     });
 
-    ws.addCallbacks("error", (d: any) => console.error("WS ERROR:", d));
+    ws.addCallbacks("error", (d: any) => {
+      console.error("WS ERROR:", d);
+      setStreaming(false);
+      setTyping(false);
+      setMessages((prev) => {
+        const last = prev[prev.length - 1];
+        const settled =
+          last?.pending
+            ? [...prev.slice(0, -1), { ...last, pending: false }]
+            : prev;
+
+        // erro enviado pelo servidor (ex: limite de mensagens): a última
+        // mensagem do usuário não foi processada → marca e mostra o aviso
+        if (d?.type === "error" && d.content) {
+          const lastUser = settled.map((m) => m.role).lastIndexOf("user");
+          const marked = settled.map((m, i) =>
+            i === lastUser ? { ...m, failed: true } : m
+          );
+          return [
+            ...marked,
+            {
+              id: crypto.randomUUID(),
+              role: "error",
+              content: d.content,
+            },
+          ];
+        }
+        return settled;
+      });
+    });
 
     ws.connect(uuid);
   }, [uuid]);
@@ -69,20 +69,29 @@ const ChatModal = ({ uuid, show, setShow }: IChatModalProps) => {
           ref={chatRef}
           className="flex flex-col gap-2 overflow-y-auto pr-1 h-full"
         >
-          {messages.map((m) => (
-            <Card
-              key={m.id}
-              className={`max-w-4/5 p-2 ${
-                m.role === "user"
-                  ? "self-end"
-                  : "self-start border-0 bg-muted/20"
-              }`}
-            >
-              <CardContent>
-                <p>{m.content}</p>
-              </CardContent>
-            </Card>
-          ))}
+          {messages.map((m) =>
+            m.role === "error" ? (
+              <p
+                key={m.id}
+                className="self-center text-center text-sm text-destructive"
+              >
+                {m.content}
+              </p>
+            ) : (
+              <Card
+                key={m.id}
+                className={`max-w-4/5 p-2 ${
+                  m.role === "user"
+                    ? "self-end"
+                    : "self-start border-0 bg-muted/20"
+                } ${m.failed ? "opacity-50" : ""}`}
+              >
+                <CardContent>
+                  <p>{m.content}</p>
+                </CardContent>
+              </Card>
+            )
+          )}
 
           {typing && <TypingIndicator />}
         </div>